@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
 
 application = get_asgi_application()
+
+# Only serving processes warm up; management commands and Celery (which warms
+# each worker child after fork) never load this module
+from recommender.services import recommender  # noqa: E402
+recommender.warmup()
@@ -0,0 +1,15 @@
+import os
+
+from celery import Celery
+
+from .threads import configure_native_threads
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+
+# core/__init__.py imports this module, so this one call also covers
+# manage.py, wsgi.py and asgi.py before numpy or onnxruntime load
+configure_native_threads()
+
+app = Celery('core')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
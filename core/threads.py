@@ -0,0 +1,10 @@
+import os
+
+
+def configure_native_threads():
+    """
+    Cap BLAS/OpenMP thread pools at one per physical core.
+    Must run before numpy or onnxruntime is imported; explicit env values win.
+    """
+    os.environ.setdefault('OMP_NUM_THREADS', str(max(1, (os.cpu_count() or 1) // 2)))
+    os.environ.setdefault('MKL_NUM_THREADS', os.environ['OMP_NUM_THREADS'])
@@ -1,7 +1,7 @@
 import os
 import django
 import pandas as pd
-from django.db import connection
+from django.db import connection, transaction
 
 # Setup Django environment
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
@@ -17,24 +17,38 @@ with connection.cursor() as cursor:
 
 # Load CSV
 df = pd.read_csv(r"C:\Users\aryan jadhav\Downloads\intenship_data_project.xls")
-df = df.dropna(subset=['Skills'])
-df = df.iloc[:7000]  
-
-# Iterate and create Internship objects
-for idx, row in df.iterrows():
-    skills = str(row['Skills']).strip()
-    skills_list = skills.split('  ')[1:]
-
-    Internship.objects.create(
-        title=row['Title'],
-        description=row['Description'],
-        company=row.get('Company', ''),
-        location=row.get('Locations', ''),
-        duration=row.get('Duration', ''),
-        stipend=row.get('Stipend', ''),
-        job_type=row.get('Job Type', 'on-site'),
+df = df.dropna(subset=['Skills']).head(7000)
+
+# Column-wise preparation in pandas instead of per-row Python string handling
+df['skills_list'] = df['Skills'].astype(str).str.strip().str.split('  ').str[1:]
+for col, default in (('Company', ''), ('Locations', ''), ('Duration', ''), ('Stipend', ''), ('Job Type', 'on-site')):
+    df[col] = df[col].fillna(default) if col in df.columns else default
+
+# Build Internship objects in memory, then insert them in a few multi-row batches
+columns = ['Title', 'Description', 'Company', 'Locations', 'Duration', 'Stipend', 'Job Type', 'skills_list']
+internships = [
+    Internship(
+        title=title,
+        description=description,
+        company=company,
+        location=location,
+        duration=duration,
+        stipend=stipend,
+        job_type=job_type,
         skills_required=skills_list,
+        skills_normalized=Internship.normalize_skills(skills_list),
         vector_id=idx
     )
+    for idx, title, description, company, location, duration, stipend, job_type, skills_list
+    in df[columns].itertuples(index=True, name=None)
+]
+
+# WAL + relaxed sync keeps SQLite from fsyncing on every batch
+with connection.cursor() as cursor:
+    cursor.execute("PRAGMA journal_mode=WAL;")
+    cursor.execute("PRAGMA synchronous=NORMAL;")
+
+with transaction.atomic():
+    Internship.objects.bulk_create(internships, batch_size=1000)
 
 print(f"{len(df)} internships imported successfully!")
@@ -1,9 +1,12 @@
 import os
+import uuid
 import django
+import faiss
 from pathlib import Path
 
-from langchain_community.embeddings import HuggingFaceEmbeddings
+from langchain_community.docstore.in_memory import InMemoryDocstore
 from langchain_community.vectorstores import FAISS
+from langchain_community.vectorstores.utils import DistanceStrategy
 from langchain_core.documents import Document
 
 # -------------------- Django setup --------------------
@@ -12,12 +15,12 @@ os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
 django.setup()
 
 from recommender.models import Internship
+from recommender.onnx_embeddings import ONNXEmbeddings
 
 # -------------------- Embeddings --------------------
 
-embeddings = HuggingFaceEmbeddings(
-    model_name="sentence-transformers/all-MiniLM-L6-v2"
-)
+# Same ONNX encoder the app uses for queries; batches internally by token length
+embeddings = ONNXEmbeddings()
 
 # -------------------- FAISS path (MUST match services.py) --------------------
 
@@ -28,12 +31,16 @@ FAISS_PATH.parent.mkdir(parents=True, exist_ok=True)
 
 # -------------------- Load internships --------------------
 
-internships = Internship.objects.all().order_by("id")
+internships = Internship.objects.only(
+    "id", "title", "company", "description", "skills_required",
+    "location", "duration", "stipend"
+).order_by("id")
 print("DB rows:", internships.count())
 
 docs = []
 
-for internship in internships:
+# Stream rows in chunks instead of caching the whole queryset
+for internship in internships.iterator(chunk_size=500):
     skills_text = ", ".join(internship.skills_required or [])
 
     text = f"""
@@ -73,7 +80,37 @@ if FAISS_PATH.exists():
     import shutil
     shutil.rmtree(FAISS_PATH)
 
-vector_store = FAISS.from_documents(docs, embeddings)
+# "hnsw" (default) for fast graph search, "hnswsq8" for the same graph over int8-quantised
+# vectors (4x less memory to scan), "ivfpq" for ~8x smaller memory footprint
+INDEX_TYPE = os.getenv("FAISS_INDEX_TYPE", "hnsw")
+
+vectors = embeddings.embed_array([doc.page_content for doc in docs])
+dim = vectors.shape[1]
+
+if INDEX_TYPE == "ivfpq":
+    index = faiss.index_factory(dim, "IVF128,PQ32", faiss.METRIC_INNER_PRODUCT)
+    index.train(vectors)
+elif INDEX_TYPE == "hnswsq8":
+    # Per-dimension int8 scalar quantisation; train() learns the value ranges
+    index = faiss.IndexHNSWSQ(dim, faiss.ScalarQuantizer.QT_8bit, 32, faiss.METRIC_INNER_PRODUCT)
+    index.hnsw.efConstruction = 200
+    index.train(vectors)
+else:
+    # Embeddings are L2-normalised, so inner product == cosine similarity
+    index = faiss.IndexHNSWFlat(dim, 32, faiss.METRIC_INNER_PRODUCT)
+    index.hnsw.efConstruction = 200
+
+index.add(vectors)
+
+doc_ids = [str(uuid.uuid4()) for _ in docs]
+
+vector_store = FAISS(
+    embedding_function=embeddings,
+    index=index,
+    docstore=InMemoryDocstore(dict(zip(doc_ids, docs))),
+    index_to_docstore_id=dict(enumerate(doc_ids)),
+    distance_strategy=DistanceStrategy.MAX_INNER_PRODUCT
+)
 vector_store.save_local(str(FAISS_PATH))
 
 print("✅ FAISS index created successfully")
@@ -0,0 +1,29 @@
+from pathlib import Path
+
+from onnxruntime.quantization import QuantType, quantize_dynamic
+
+# -------------------- Paths (MUST match onnx_embeddings.py) --------------------
+
+MODEL_DIR = Path(__file__).resolve().parent / "onnx_model"
+FP32_MODEL = MODEL_DIR / "model.onnx"
+INT8_MODEL = MODEL_DIR / "model.int8.onnx"
+
+# -------------------- Quantize --------------------
+
+if not FP32_MODEL.exists():
+    print(f"❌ {FP32_MODEL} not found. Nothing to quantize.")
+    exit(1)
+
+quantize_dynamic(
+    model_input=str(FP32_MODEL),
+    model_output=str(INT8_MODEL),
+    weight_type=QuantType.QInt8
+)
+
+print("✅ INT8 model written to", INT8_MODEL)
+print(f"📦 Size: {FP32_MODEL.stat().st_size / 1e6:.1f} MB -> {INT8_MODEL.stat().st_size / 1e6:.1f} MB")
+
+# onnx_embeddings.py switches to the INT8 model as soon as it exists, but the
+# FAISS index and cached embeddings/matches still hold FP32 vectors
+print("⚠️  Re-run load_internships_faiss.py to rebuild the FAISS index with the INT8 model,")
+print("   then clear the cache (flush Redis or restart the server) before serving queries.")
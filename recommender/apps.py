@@ -5,3 +5,6 @@ class InternshipsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'recommender'
     verbose_name = 'Internship Recommender'
+
+    def ready(self):
+        from . import signals  # noqa: F401
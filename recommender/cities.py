@@ -0,0 +1,26 @@
+from django.core.cache import cache
+
+from .models import Internship
+
+CITY_LIST_CACHE_KEY = "internship:cities:v1"
+
+
+def get_active_city_list():
+    """
+    Sorted, de-duplicated cities across active internships for the location filter.
+    Cached for an hour; signals.py clears it whenever an internship is saved or deleted.
+    """
+    def compute():
+        locations = Internship.objects.filter(
+            is_active=True
+        ).values_list("location", flat=True).distinct()
+
+        # Stream locations in chunks instead of materialising them all at once
+        city_set = set()
+        for loc in locations.iterator(chunk_size=500):
+            if loc:
+                city_set.update(cleaned for cleaned in (city.strip() for city in loc.split(",")) if cleaned)
+
+        return sorted(city_set)
+
+    return cache.get_or_set(CITY_LIST_CACHE_KEY, compute, timeout=3600)
@@ -0,0 +1,21 @@
+from django.utils.functional import SimpleLazyObject
+
+from .models import UserProfile
+
+
+class ProfileMiddleware:
+    """
+    Expose the logged-in user's UserProfile as request.profile.
+    The profile is fetched (or created) on first access and reused for the rest
+    of the request, so views never query it more than once. Only access it
+    behind login_required.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.profile = SimpleLazyObject(
+            lambda: UserProfile.objects.get_or_create(user=request.user)[0]
+        )
+        return self.get_response(request)
@@ -0,0 +1,32 @@
+# Generated by Django 6.0.1 on 2026-10-15 10:02
+
+from django.db import migrations, models
+
+
+def populate_skills_normalized(apps, schema_editor):
+    Internship = apps.get_model('recommender', 'Internship')
+    batch = []
+    for internship in Internship.objects.only('id', 'skills_required').iterator(chunk_size=1000):
+        internship.skills_normalized = [skill.lower().strip() for skill in internship.skills_required or []]
+        batch.append(internship)
+        if len(batch) >= 1000:
+            Internship.objects.bulk_update(batch, ['skills_normalized'])
+            batch = []
+    if batch:
+        Internship.objects.bulk_update(batch, ['skills_normalized'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recommender', '0003_remove_internship_is_embedded_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='internship',
+            name='skills_normalized',
+            field=models.JSONField(blank=True, default=list, help_text='Lowercased, stripped skills used for matching'),
+        ),
+        migrations.RunPython(populate_skills_normalized, migrations.RunPython.noop),
+    ]
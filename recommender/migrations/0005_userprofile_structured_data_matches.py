@@ -0,0 +1,23 @@
+# Generated by Django 6.0.1 on 2026-10-15 11:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recommender', '0004_internship_skills_normalized'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='matches',
+            field=models.JSONField(blank=True, default=list, help_text='Last computed internship matches'),
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='structured_data',
+            field=models.JSONField(blank=True, default=dict, help_text='Last Gemini-parsed resume'),
+        ),
+    ]
@@ -0,0 +1,64 @@
+from django.db import migrations
+
+
+FTS_TABLE = 'recommender_internship_fts'
+TABLE = 'recommender_internship'
+
+CREATE_SQL = [
+    f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+    f"title, description, company, content='{TABLE}', content_rowid='id', tokenize='trigram')",
+
+    f"""CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON {TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, description, company)
+        VALUES (new.id, new.title, new.description, new.company);
+    END""",
+
+    f"""CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON {TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description, company)
+        VALUES ('delete', old.id, old.title, old.description, old.company);
+    END""",
+
+    # Model.save() writes every column, so UPDATE OF alone would still fire on
+    # is_active or skills changes; the WHEN clause skips rows whose text is unchanged
+    f"""CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE OF title, description, company ON {TABLE}
+    WHEN old.title IS NOT new.title
+        OR old.description IS NOT new.description
+        OR old.company IS NOT new.company
+    BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description, company)
+        VALUES ('delete', old.id, old.title, old.description, old.company);
+        INSERT INTO {FTS_TABLE}(rowid, title, description, company)
+        VALUES (new.id, new.title, new.description, new.company);
+    END""",
+
+    # Index the rows that already exist
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+DROP_SQL = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+
+def _run_on_sqlite(statements):
+    def run(apps, schema_editor):
+        # FTS5 is SQLite-only; other backends keep the icontains search
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for sql in statements:
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recommender', '0005_userprofile_structured_data_matches'),
+    ]
+
+    operations = [
+        migrations.RunPython(_run_on_sqlite(CREATE_SQL), _run_on_sqlite(DROP_SQL)),
+    ]
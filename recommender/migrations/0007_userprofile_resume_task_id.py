@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-15 14:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recommender', '0006_internship_fts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='resume_task_id',
+            field=models.CharField(blank=True, help_text='Celery task processing the last uploaded resume', max_length=255),
+        ),
+    ]
@@ -10,6 +10,9 @@ class UserProfile(models.Model):
     parsed_skills = models.JSONField(default=list, blank=True, help_text="Normalized skills list")
     
     vector_summary = models.TextField(blank=True, help_text="Structured summary used for embeddings")
+    structured_data = models.JSONField(default=dict, blank=True, help_text="Last Gemini-parsed resume")
+    matches = models.JSONField(default=list, blank=True, help_text="Last computed internship matches")
+    resume_task_id = models.CharField(max_length=255, blank=True, help_text="Celery task processing the last uploaded resume")
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -36,6 +39,7 @@ class Internship(models.Model):
     company = models.CharField(max_length=255, default="Unknown Company")
     description = models.TextField()
     skills_required = models.JSONField(default=list, blank=True, help_text="List of required skills")
+    skills_normalized = models.JSONField(default=list, blank=True, help_text="Lowercased, stripped skills used for matching")
     
     location = models.CharField(max_length=255, blank=True)
     duration = models.CharField(max_length=100, blank=True)
@@ -61,3 +65,12 @@ class Internship(models.Model):
 
     def __str__(self):
         return f"{self.title} at {self.company}"
+
+    @staticmethod
+    def normalize_skills(skills):
+        return [skill.lower().strip() for skill in skills or []]
+
+    def save(self, *args, **kwargs):
+        self.skills_normalized = self.normalize_skills(self.skills_required)
+        super().save(*args, **kwargs)
+
@@ -1,4 +1,5 @@
 import os
+import threading
 import numpy as np
 import onnxruntime as ort
 from transformers import AutoTokenizer
@@ -6,31 +7,95 @@ from langchain_core.embeddings import Embeddings
 from django.conf import settings
 
 
+# all-MiniLM-L6-v2 was trained with 256-token inputs. onnx_model/ has no
+# tokenizer_config.json, so the tokenizer has no model_max_length and
+# truncation=True alone would not truncate at all.
+MAX_SEQ_LENGTH = 256
+
+
 class ONNXEmbeddings(Embeddings):
-    def __init__(self, model_path=None):
+    def __init__(self, model_path=None, batch_size=32):
         if model_path is None:
             model_path = os.path.join(settings.BASE_DIR, "onnx_model")
 
+        # Rust-backed tokenizer; needs tokenizer.json in model_path. Regenerate with
+        # AutoTokenizer.from_pretrained("sentence-transformers/all-MiniLM-L6-v2").save_pretrained("onnx_model")
         self.tokenizer = AutoTokenizer.from_pretrained(
             model_path,
-            local_files_only=True
+            local_files_only=True,
+            use_fast=True
         )
+        if not self.tokenizer.is_fast:
+            raise RuntimeError(f"No fast tokenizer (tokenizer.json) found in {model_path}")
 
-        self.session = ort.InferenceSession(
-            os.path.join(model_path, "model.onnx")
-        )
+        # Prefer the INT8 model produced by quantize_onnx_model.py, fall back to FP32
+        model_file = os.path.join(model_path, "model.int8.onnx")
+        if not os.path.exists(model_file):
+            model_file = os.path.join(model_path, "model.onnx")
+        self.model_file = model_file
+
+        # Created on first use: an InferenceSession's thread pool does not survive
+        # fork, so each Celery/gunicorn child must build its own
+        self._session = None
+        self._session_lock = threading.Lock()
+
+        self.batch_size = batch_size
+
+    @property
+    def session(self):
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    session_options = ort.SessionOptions()
+                    session_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+                    # One intra-op thread per physical core (cpu_count counts hyperthreads)
+                    session_options.intra_op_num_threads = max(1, (os.cpu_count() or 1) // 2)
+                    session_options.inter_op_num_threads = 1
+                    session_options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+
+                    self._session = ort.InferenceSession(
+                        self.model_file,
+                        sess_options=session_options,
+                        providers=["CPUExecutionProvider"]
+                    )
+        return self._session
 
     def embed_documents(self, texts):
-        return self._embed(texts)
+        return self.embed_array(texts).tolist()
 
     def embed_query(self, text):
-        return self._embed([text])[0]
+        return self.embed_array([text])[0].tolist()
 
-    def _embed(self, texts):
+    def embed_array(self, texts):
+        """Return a contiguous float32 ndarray of shape (len(texts), hidden_size)."""
+        if len(texts) <= self.batch_size:
+            return self._embed_batch(texts)
+
+        # Sort by token length so each mini-batch is padded only to its own longest text
+        lengths = [
+            len(ids) for ids in self.tokenizer(texts, truncation=True, max_length=MAX_SEQ_LENGTH)["input_ids"]
+        ]
+        order = np.argsort(lengths, kind="stable")
+
+        batches = []
+        for start in range(0, len(texts), self.batch_size):
+            chunk = [texts[i] for i in order[start:start + self.batch_size]]
+            batches.append(self._embed_batch(chunk))
+
+        sorted_embeddings = np.concatenate(batches)
+
+        # Restore the caller's ordering
+        inverse = np.empty_like(order)
+        inverse[order] = np.arange(len(order))
+
+        return np.ascontiguousarray(sorted_embeddings[inverse])
+
+    def _embed_batch(self, texts):
         inputs = self.tokenizer(
             texts,
             padding=True,
             truncation=True,
+            max_length=MAX_SEQ_LENGTH,
             return_tensors="np"
         )
 
@@ -40,13 +105,16 @@ class ONNXEmbeddings(Embeddings):
             ort_inputs[name] = inputs[name]
 
         outputs = self.session.run(None, ort_inputs)
-        token_embeddings = outputs[0]
+        token_embeddings = np.ascontiguousarray(outputs[0], dtype=np.float32)
+
+        attention_mask = inputs["attention_mask"].astype(np.float32)
 
-        attention_mask = inputs["attention_mask"]
+        # Mean pooling without materialising a (batch, tokens, hidden) temporary
+        summed = np.einsum("bth,bt->bh", token_embeddings, attention_mask)
+        lengths = attention_mask.sum(axis=1, keepdims=True)
+        embeddings = summed / np.maximum(lengths, 1e-9)
 
-        embeddings = np.sum(
-            token_embeddings * attention_mask[..., None],
-            axis=1
-        ) / np.sum(attention_mask, axis=1, keepdims=True)
+        # L2-normalise, matching the Normalize layer of all-MiniLM-L6-v2
+        embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True) + 1e-12
 
-        return embeddings.tolist()
\ No newline at end of file
+        return embeddings
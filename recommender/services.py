@@ -1,19 +1,25 @@
 import os
+import hashlib
 import logging
+import threading
 from typing import List, Dict, Tuple
 from pathlib import Path
 from pydantic import BaseModel, Field
 
+import faiss
+
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
 from langchain_community.vectorstores import FAISS
+from langchain_community.vectorstores.utils import DistanceStrategy
 from langchain_core.documents import Document
 from .models import Internship
 from .onnx_embeddings import ONNXEmbeddings
 
 
 from django.conf import settings
+from django.core.cache import cache
 
 logger = logging.getLogger(__name__)
 
@@ -45,6 +51,27 @@ class ResumeData(BaseModel):
     summary: str = Field(default="")
 
 
+# -------------------- Prompt --------------------
+
+RESUME_PARSER_TEMPLATE = """You are an expert resume parser. Extract structured information from the following resume text.
+        The text may be messy due to 2 columns PDF extraction. Please parse it carefully and return a clean JSON object.
+
+        Resume Text:
+        {resume_text}
+
+        {format_instructions}
+
+        Important:
+        - Extract ALL skills mentioned (technical, programming languages, frameworks, tools, soft skills) as name by removing irregular words like machine learning and not basics of machine learning.
+        - For education, include degree
+        - For experience, include job title, key responsibilities
+        - For projects, include project name, description, and technologies used
+        - As summary extract the bio if present
+        - If a field is not found, use appropriate default values (empty string or empty list)
+
+        Return ONLY the JSON object, no additional text."""
+
+
 # -------------------- Core Service --------------------
 
 class RecommenderService:
@@ -65,12 +92,22 @@ class RecommenderService:
             max_output_tokens=2048
         )
 
+        # Built once: get_format_instructions() walks the whole Pydantic schema
+        self._resume_parser = JsonOutputParser(pydantic_object=ResumeData)
+        self._resume_prompt = PromptTemplate(
+            input_variables=["resume_text"],
+            partial_variables={"format_instructions": self._resume_parser.get_format_instructions()},
+            template=RESUME_PARSER_TEMPLATE
+        )
+        self._resume_chain = self._resume_prompt | self.llm | self._resume_parser
+
         self.embeddings = ONNXEmbeddings(
         model_path=os.path.join(settings.BASE_DIR, "onnx_model")
     )
 
         self.vector_store_path = Path(settings.BASE_DIR) / "vector_db" / "faiss_index"
         self.vector_store = None
+        self._vector_store_lock = threading.Lock()
 
     # -------------------- Resume Parsing --------------------
 
@@ -83,35 +120,8 @@ class RecommenderService:
             dict: Structured resume data with skills, experience, education, etc.
         """
 
-        parser = JsonOutputParser(pydantic_object=ResumeData)
-
-        prompt_template = PromptTemplate(
-                input_variables=["resume_text"],
-                partial_variables={"format_instructions": parser.get_format_instructions()},
-                template="""You are an expert resume parser. Extract structured information from the following resume text.
-        The text may be messy due to 2 columns PDF extraction. Please parse it carefully and return a clean JSON object.
-
-        Resume Text:
-        {resume_text}
-
-        {format_instructions}
-
-        Important:
-        - Extract ALL skills mentioned (technical, programming languages, frameworks, tools, soft skills) as name by removing irregular words like machine learning and not basics of machine learning.
-        - For education, include degree
-        - For experience, include job title, key responsibilities
-        - For projects, include project name, description, and technologies used
-        - As summary extract the bio if present
-        - If a field is not found, use appropriate default values (empty string or empty list)
-
-        Return ONLY the JSON object, no additional text."""
-            )
-
         try:
-            chain = prompt_template | self.llm | parser
-            structured_data = chain.invoke({"resume_text": raw_text})
-
-            return structured_data
+            return self._resume_chain.invoke({"resume_text": raw_text})
 
         except Exception as e:
             logger.error(f"Resume parsing failed: {e}", exc_info=True)
@@ -135,48 +145,86 @@ class RecommenderService:
         if data.get("skills"):
             parts.append("Skills: " + ", ".join(data["skills"]))
 
-        if data.get("experience"):
-            exp_blocks = []
-            for e in data["experience"][:3]:
-                exp_blocks.append(f"{e['title']} at {e['company']}: {e['description'][:150]}")
-            parts.append("Experience: " + " | ".join(exp_blocks))
+        experience = " | ".join(
+            f"{e.get('title', '')} at {e.get('company', '')}: {(e.get('description') or '')[:150]}"
+            for e in (data.get("experience") or [])[:3]
+        )
+        if experience:
+            parts.append("Experience: " + experience)
 
-        if data.get("projects"):
-            proj_blocks = []
-            for p in data["projects"][:3]:
-                proj_blocks.append(f"{p['name']}: {p['description']} ({p['technologies']})")
-            parts.append("Projects: " + " | ".join(proj_blocks))
+        projects = " | ".join(
+            f"{p.get('name', '')}: {p.get('description', '')} ({p.get('technologies', '')})"
+            for p in (data.get("projects") or [])[:3]
+        )
+        if projects:
+            parts.append("Projects: " + projects)
 
-        if data.get("education"):
-            edu_blocks = []
-            for e in data["education"][:2]:
-                edu_blocks.append(f"{e['degree']} from {e['institution']}")
-            parts.append("Education: " + " | ".join(edu_blocks))
+        education = " | ".join(
+            f"{e.get('degree', '')} from {e.get('institution', '')}"
+            for e in (data.get("education") or [])[:2]
+        )
+        if education:
+            parts.append("Education: " + education)
 
         return "\n".join(parts)
 
     # -------------------- FAISS Vector Store --------------------
 
     def load_or_create_vector_store(self):
+        """
+        Load the FAISS store once per process; concurrent first callers share one load.
+        """
         if self.vector_store:
             return self.vector_store
 
-        if not (self.vector_store_path / "index.faiss").exists():
-            raise RuntimeError(
-                f"FAISS index not found at {self.vector_store_path}. "
-                "Run load_internships_faiss.py first."
+        with self._vector_store_lock:
+            if self.vector_store:
+                return self.vector_store
+
+            if not (self.vector_store_path / "index.faiss").exists():
+                raise RuntimeError(
+                    f"FAISS index not found at {self.vector_store_path}. "
+                    "Run load_internships_faiss.py first."
+                )
+
+            store = FAISS.load_local(
+                str(self.vector_store_path),
+                self.embeddings,
+                allow_dangerous_deserialization=True
             )
 
-        self.vector_store = FAISS.load_local(
-            str(self.vector_store_path),
-            self.embeddings,
-            allow_dangerous_deserialization=True
-        )
+            # load_local does not persist the distance strategy; derive it from the index
+            if store.index.metric_type == faiss.METRIC_INNER_PRODUCT:
+                store.distance_strategy = DistanceStrategy.MAX_INNER_PRODUCT
+            else:
+                store.distance_strategy = DistanceStrategy.EUCLIDEAN_DISTANCE
+
+            # Query-time search breadth for approximate indexes built by load_internships_faiss.py
+            if hasattr(store.index, "hnsw"):
+                store.index.hnsw.efSearch = 64
+            elif hasattr(store.index, "nprobe"):
+                store.index.nprobe = 16
+
+            self.vector_store = store
 
         logger.info(f"FAISS loaded with {self.vector_store.index.ntotal} vectors")
         return self.vector_store
 
 
+    def warmup(self):
+        """
+        Load the FAISS index and run one dummy embedding so the first real
+        request does not pay for index loading or ONNX Runtime's first-run setup.
+        """
+        try:
+            self.load_or_create_vector_store()
+        except RuntimeError as e:
+            logger.warning(f"FAISS preload skipped: {e}")
+
+        self.embeddings.embed_array(["warmup"])
+        logger.info("Recommender warmed up")
+
+
     # -------------------- Internship Embedding --------------------
 
     def add_internships_to_vector_store(self, internships):
@@ -206,58 +254,78 @@ Stipend: {internship.stipend}
             documents.append(doc)
 
         if documents:
-            self.vector_store.add_documents(documents)
+            # Embed everything in one call so ONNXEmbeddings can batch it
+            texts = [doc.page_content for doc in documents]
+            metadatas = [doc.metadata for doc in documents]
+            vectors = self.embeddings.embed_array(texts)
+
+            self.vector_store.add_embeddings(
+                text_embeddings=list(zip(texts, vectors)),
+                metadatas=metadatas
+            )
             self.vector_store.save_local(str(self.vector_store_path))
 
 
-    def get_matching_skills(self ,internship_skills_required: str ,resume_skills: str):
-        matching ,non_matching = [] ,[]
-        for skill in internship_skills_required:
-            if skill in resume_skills:
-                matching.append(skill)
-            else:
-                non_matching.append(skill)
+    # -------------------- Similarity Search --------------------
 
-        return matching ,non_matching
+    def embed_vector_summary(self, vector_summary: str):
+        """
+        Embed a profile's vector summary, reusing the cached vector while the summary is unchanged.
+        """
+        digest = hashlib.blake2b(vector_summary.encode(), digest_size=16).hexdigest()
+        key = f"emb:{digest}"
 
+        embedding = cache.get(key)
+        if embedding is None:
+            embedding = self.embeddings.embed_array([vector_summary])[0]
+            cache.set(key, embedding, 3600)
 
-    # -------------------- Similarity Search --------------------
+        return embedding
 
     def find_matching_internships(self, vector_summary: str, resume_skills: list, top_k: int = 10):
         self.load_or_create_vector_store()
 
-        results = self.vector_store.similarity_search_with_score(
-            vector_summary,
+        results = self.vector_store.similarity_search_with_score_by_vector(
+            self.embed_vector_summary(vector_summary),
             k=top_k 
         )
 
+        # One query for all hits instead of one per result
+        ids = [doc.metadata["id"] for doc, _ in results if doc.metadata.get("id") is not None]
+        internships = Internship.objects.only("id", "skills_normalized").in_bulk(ids)
+
+        # Inner-product indexes return cosine similarity directly; older L2 indexes
+        # return squared distance between unit vectors, i.e. 2 - 2 * cosine
+        inner_product = self.vector_store.distance_strategy == DistanceStrategy.MAX_INNER_PRODUCT
+
         matches = []
-        resume_skills_lower = [s.lower().strip() for s in resume_skills]
+        resume_set = frozenset(s.lower().strip() for s in resume_skills)
 
-        for doc, distance in results:
+        for doc, score in results:
             internship_id = doc.metadata.get("id")
 
             if internship_id is None:
                 continue
 
-            internship = Internship.objects.filter(id=internship_id).first()
+            internship = internships.get(internship_id)
             if not internship:
                 continue
 
             # FAISS similarity
-            faiss_similarity = 1 / (1 + float(distance))
+            faiss_similarity = float(score) if inner_product else 1 - float(score) / 2
 
-            # Skill similarity
-            if internship and internship.skills_required: 
-                internship_skills = [s.lower() for s in internship.skills_required] 
-                matched = len(set(resume_skills_lower) & set(internship_skills)) 
-                skill_score = matched / len(internship_skills) if internship_skills else 0 
-            else: 
-                skill_score = 0
+            # Skill similarity: one pass over the (deduplicated, ordered) internship skills
+            matching_skills, non_matching_skills = [], []
+            for skill in dict.fromkeys(internship.skills_normalized):
+                if skill in resume_set:
+                    matching_skills.append(skill)
+                else:
+                    non_matching_skills.append(skill)
 
-            final_score = 0.8 * skill_score + 0.2 * faiss_similarity
+            total_skills_count = len(matching_skills) + len(non_matching_skills)
+            skill_score = len(matching_skills) / total_skills_count if total_skills_count else 0
 
-            matching_skills, non_matching_skills = self.get_matching_skills(internship_skills, resume_skills_lower)
+            final_score = 0.8 * skill_score + 0.2 * faiss_similarity
 
             matches.append({
                 "id": internship_id,
@@ -269,11 +337,11 @@ Stipend: {internship.stipend}
                 "matching_skills": matching_skills,
                 "non_matching_skills": non_matching_skills,
                 "matching_skills_count": len(matching_skills),
-                "total_skills_count": len(non_matching_skills) + len(matching_skills)
+                "total_skills_count": total_skills_count
             })
 
         matches.sort(key=lambda x: x["final_score"], reverse=True)
-        print(f"Found {len(matches)} matches,{matches}")
+        logger.debug("Found %d matches: %s", len(matches), [m["id"] for m in matches])
 
         return matches[:top_k]
 
@@ -283,3 +351,23 @@ Stipend: {internship.stipend}
 # Global instance
 recommender = RecommenderService()
 
+
+def get_cached_matches(profile, top_k: int = 10):
+    """
+    find_matching_internships for a profile, cached for an hour.
+    The key hashes the profile's vector summary and skills, so editing either
+    produces a new key and stale results are never served for a changed profile.
+    """
+    skills = profile.parsed_skills or []
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(profile.vector_summary.encode())
+    digest.update(b"\0")
+    digest.update(",".join(sorted(skills)).encode())
+    key = f"match:{digest.hexdigest()}:{top_k}"
+
+    return cache.get_or_set(
+        key,
+        lambda: recommender.find_matching_internships(profile.vector_summary, resume_skills=skills, top_k=top_k),
+        timeout=3600
+    )
+
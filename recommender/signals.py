@@ -0,0 +1,12 @@
+from django.core.cache import cache
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Internship
+from .cities import CITY_LIST_CACHE_KEY
+
+
+@receiver(post_save, sender=Internship)
+@receiver(post_delete, sender=Internship)
+def clear_city_list_cache(sender, **kwargs):
+    cache.delete(CITY_LIST_CACHE_KEY)
@@ -0,0 +1,57 @@
+import logging
+
+from celery import shared_task
+from celery.signals import worker_process_init
+
+from .models import UserProfile
+from .utils import clean_extracted_text
+from .services import recommender, get_cached_matches
+
+logger = logging.getLogger(__name__)
+
+
+@worker_process_init.connect
+def warm_up_recommender(**kwargs):
+    recommender.warmup()
+
+
+@shared_task
+def process_resume(profile_id, raw_text):
+    """
+    Run the resume pipeline (clean → Gemini structuring → vector summary → matching)
+    for an uploaded resume and store the results on the profile.
+    Args:
+        profile_id (int): UserProfile whose resume_file has just been saved
+        raw_text (str): Text extracted from the uploaded PDF by the view
+    Returns:
+        int: The processed profile id
+    """
+    profile = UserProfile.objects.get(id=profile_id)
+
+    cleaned_text = clean_extracted_text(raw_text)
+
+    structured_data = recommender.clean_resume_text(cleaned_text)
+
+    def normalize(skills):
+        for skill in skills or ():
+            if skill:
+                skill = skill.strip().lower()
+                if skill:
+                    yield skill
+
+    # Existing skills first, then newly extracted ones; dict.fromkeys keeps order and drops duplicates
+    profile.parsed_skills = list(dict.fromkeys([
+        *normalize(profile.parsed_skills),
+        *normalize(structured_data.get('skills', []))
+    ]))
+
+    vector_summary = recommender.create_vector_summary(structured_data)
+    profile.vector_summary = vector_summary
+
+    profile.structured_data = structured_data
+    profile.matches = get_cached_matches(profile, top_k=10)
+    profile.save(update_fields=['parsed_skills', 'vector_summary', 'structured_data', 'matches', 'updated_at'])
+
+    logger.info(f"Processed resume for profile {profile_id} with {len(profile.matches)} matches")
+
+    return profile_id
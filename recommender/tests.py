@@ -1,3 +1,150 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
 from django.test import TestCase
+from django.urls import reverse
+
+from .models import Internship, UserProfile
+from .utils import search_internships
+from .views import PAGE_SIZE
+
+
+class SearchInternshipsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.cpp = Internship.objects.create(
+            title="C++ Developer Intern", company="Acme",
+            description="Systems programming on embedded devices", vector_id="test-1",
+        )
+        cls.csharp = Internship.objects.create(
+            title="C# .NET Intern", company="Globex",
+            description="Build internal tools", vector_id="test-2",
+        )
+        cls.data = Internship.objects.create(
+            title="Data Science Intern", company="Initech",
+            description="Train models in Python", vector_id="test-3",
+        )
+
+    def search(self, query):
+        return set(search_internships(Internship.objects.all(), query).values_list('id', flat=True))
+
+    def test_symbol_query_matches_literal_text(self):
+        self.assertEqual(self.search("C++"), {self.cpp.id})
+        self.assertEqual(self.search("C#"), {self.csharp.id})
+
+    def test_word_query_is_case_insensitive_across_columns(self):
+        self.assertEqual(self.search("data science"), {self.data.id})
+        self.assertEqual(self.search("PYTHON"), {self.data.id})
+        self.assertEqual(self.search("globex"), {self.csharp.id})
+
+
+class ResumeTaskViewsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("alice", password="pw")
+        cls.other = User.objects.create_user("bob", password="pw")
+        UserProfile.objects.create(user=cls.user, resume_task_id="task-alice")
+        UserProfile.objects.create(user=cls.other, resume_task_id="task-bob")
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_foreign_or_stale_task_id_is_not_found(self):
+        for name in ('processing', 'task_status'):
+            for task_id in ('task-bob', 'stale-task'):
+                with self.subTest(view=name, task_id=task_id):
+                    response = self.client.get(reverse(f'recommender:{name}', args=[task_id]))
+                    self.assertEqual(response.status_code, 404)
+
+    @mock.patch('recommender.views.AsyncResult')
+    def test_owner_task_id_is_served(self, async_result):
+        async_result.return_value.state = "STARTED"
+
+        response = self.client.get(reverse('recommender:processing', args=["task-alice"]))
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.get(reverse('recommender:task_status', args=["task-alice"]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'state': "STARTED"})
+        async_result.assert_called_once_with("task-alice")
+
+
+class ResumeResultsViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("alice", password="pw")
+        cls.active = Internship.objects.create(
+            title="Backend Intern", description="Django APIs", vector_id="test-1",
+        )
+        cls.inactive = Internship.objects.create(
+            title="Closed Intern", description="No longer open", vector_id="test-2", is_active=False,
+        )
+        UserProfile.objects.create(user=cls.user, matches=[
+            {'id': cls.active.id, 'final_score': 0.91, 'matching_skills_count': 2, 'total_skills_count': 3},
+            {'id': cls.inactive.id, 'final_score': 0.85},
+            {'id': "not-a-number", 'final_score': 0.8},
+            {'final_score': 0.7},
+            {'id': cls.active.id, 'final_score': None},
+            "garbage",
+        ])
+
+    def test_skips_inactive_and_malformed_matches(self):
+        self.client.force_login(self.user)
+
+        response = self.client.get(reverse('recommender:resume_results'))
+
+        self.assertEqual(response.status_code, 200)
+        items = response.context['recommended_internships']
+        self.assertEqual([item['internship'].id for item in items], [self.active.id])
+        self.assertEqual(items[0]['match_percentage'], 91.0)
+        self.assertEqual(items[0]['matching_skills_count'], 2)
+
+
+class InternshipListPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("alice", password="pw")
+        Internship.objects.bulk_create(
+            Internship(title=f"Intern {i}", description="Role", vector_id=f"test-{i}")
+            for i in range(2 * PAGE_SIZE + 5)
+        )
+        cls.ids = list(Internship.objects.order_by('-id').values_list('id', flat=True))
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def get_page(self, **params):
+        response = self.client.get(reverse('recommender:internship_list'), params)
+        self.assertEqual(response.status_code, 200)
+        return response.context
+
+    def page_ids(self, context):
+        return [internship.id for internship in context['internships']]
+
+    def test_next_then_previous_returns_first_page(self):
+        first = self.get_page()
+        self.assertEqual(self.page_ids(first), self.ids[:PAGE_SIZE])
+        self.assertIsNone(first['previous_cursor'])
+
+        second = self.get_page(after=first['next_cursor'])
+        self.assertEqual(self.page_ids(second), self.ids[PAGE_SIZE:2 * PAGE_SIZE])
+
+        back = self.get_page(before=second['previous_cursor'])
+        self.assertEqual(self.page_ids(back), self.page_ids(first))
+        self.assertIsNone(back['previous_cursor'])
+        self.assertEqual(back['next_cursor'], first['next_cursor'])
+
+    def test_last_page_has_no_next_cursor(self):
+        second = self.get_page(after=self.get_page()['next_cursor'])
+        last = self.get_page(after=second['next_cursor'])
+
+        self.assertEqual(self.page_ids(last), self.ids[2 * PAGE_SIZE:])
+        self.assertIsNone(last['next_cursor'])
+        self.assertIsNotNone(last['previous_cursor'])
 
-# Create your tests here.
+    def test_non_numeric_cursor_falls_back_to_first_page(self):
+        for params in ({'after': "abc"}, {'before': "abc"}):
+            with self.subTest(**params):
+                page = self.get_page(**params)
+                self.assertEqual(self.page_ids(page), self.ids[:PAGE_SIZE])
+                self.assertIsNone(page['previous_cursor'])
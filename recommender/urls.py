@@ -7,6 +7,9 @@ urlpatterns = [
     path('', views.dashboard, name='dashboard'),
     
     path('upload/', views.upload_resume, name='upload_resume'),
+    path('upload/processing/<str:task_id>/', views.processing, name='processing'),
+    path('upload/status/<str:task_id>/', views.task_status, name='task_status'),
+    path('results/', views.resume_results, name='resume_results'),
     path('edit_skills/', views.edit_skills, name='edit_skills'),
     path('internships/', views.internship_list, name='internship_list'),
     path('internships/<int:internship_id>/', views.internship_detail, name='internship_detail'),
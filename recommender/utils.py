@@ -1,36 +1,40 @@
 import fitz 
+import re
 import logging
 
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
 logger = logging.getLogger(__name__)
 
+_MULTI_NEWLINE_RE = re.compile(r'\n{3,}')
+_MULTI_SPACE_RE = re.compile(r' {2,}')
+
 
-def extract_text_from_pdf(pdf_path):
+def extract_text_from_pdf(pdf):
     """
     Extract text from PDF using block-based extraction to handle multi-column layouts.
     Args:
-        pdf_path (str): Path to the PDF file   
+        pdf (str | file-like): Path to the PDF file, or an open file such as an upload
     Returns:
         str: Extracted text from all pages
     """
     try:
-        doc = fitz.open(pdf_path)
         full_text = []
-        
-        for page_num in range(len(doc)):
-            page = doc[page_num]
-            blocks = page.get_text("blocks")
-            
-            sorted_blocks = sorted(blocks, key=lambda b: (b[1], b[0]))
-            
-            page_text = []
-            for block in sorted_blocks:
-                text = block[4].strip()
-                if text:
-                    page_text.append(text)
-            
-            full_text.append("\n".join(page_text))
-        
-        doc.close()
+
+        # File-like objects (e.g. uploads still in memory) are parsed without touching disk
+        if hasattr(pdf, "read"):
+            source = {"stream": pdf.read()}
+        else:
+            source = {"filename": pdf}
+
+        # filetype skips format sniffing; sort=True lets MuPDF order blocks by reading position
+        with fitz.open(filetype="pdf", **source) as doc:
+            for page in doc:
+                blocks = page.get_text("blocks", sort=True)
+                stripped = (block[4].strip() for block in blocks)
+                full_text.append("\n".join(text for text in stripped if text))
         
         extracted_text = "\n\n".join(full_text)
         logger.info(f"Successfully extracted {len(extracted_text)} characters from PDF")
@@ -50,12 +54,34 @@ def clean_extracted_text(text):
     Returns:
         str: Cleaned text
     """
-    import re
-    text = re.sub(r'\n{3,}', '\n\n', text)
-    text = re.sub(r' {2,}', ' ', text)
-    lines = [line.strip() for line in text.split('\n')]
-    text = '\n'.join(lines)
+    text = _MULTI_NEWLINE_RE.sub('\n\n', text)
+    text = _MULTI_SPACE_RE.sub(' ', text)
+    text = '\n'.join(line.strip() for line in text.split('\n'))
     
     return text.strip()
 
 
+def search_internships(queryset, query):
+    """
+    Filter internships whose title, description or company contain the search text (case-insensitive).
+    On SQLite this uses the trigram FTS5 index from migration 0006; queries shorter than
+    a trigram and other database backends use a plain icontains filter.
+    Args:
+        queryset (QuerySet): Internship queryset to filter
+        query (str): Search text as typed by the user
+    Returns:
+        QuerySet: Filtered queryset
+    """
+    if connection.vendor != "sqlite" or len(query) < 3:
+        return queryset.filter(
+            Q(title__icontains=query) |
+            Q(description__icontains=query) |
+            Q(company__icontains=query)
+        )
+
+    # A quoted string is a substring match under the trigram tokenizer
+    fts_query = '"' + query.replace('"', '""') + '"'
+    return queryset.filter(id__in=RawSQL(
+        "SELECT rowid FROM recommender_internship_fts WHERE recommender_internship_fts MATCH %s",
+        (fts_query,)
+    ))
@@ -1,18 +1,26 @@
+import re
+import uuid
 import logging
+from celery.result import AsyncResult
+from django.http import JsonResponse, Http404
 from django.shortcuts import render, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.views.decorators.http import require_http_methods
 from django.contrib.auth.forms import UserCreationForm
-from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
-from django.db.models import Q
 
 from .models import UserProfile, Internship
-from .utils import extract_text_from_pdf, clean_extracted_text
-from .services import recommender
+from .utils import extract_text_from_pdf, search_internships
+from .services import get_cached_matches
+from .cities import get_active_city_list
+from .tasks import process_resume
 
 logger = logging.getLogger(__name__)
 
+_SKILL_SPLIT_RE = re.compile(r'\s*,\s*')
+
+PAGE_SIZE = 20
+
 
 def register(request):
     if request.user.is_authenticated:
@@ -26,9 +34,10 @@ def register(request):
             messages.success(request, "Account created successfully.")
             return redirect('recommender:dashboard')
         else:
-            for field, errors in form.errors.items():
-                for error in errors:
-                    messages.error(request, f"{field}: {error}")
+            # One message (one session write) for all field errors
+            messages.error(request, "; ".join(
+                f"{field}: {error}" for field, errors in form.errors.items() for error in errors
+            ))
     else:
         form = UserCreationForm()
 
@@ -37,20 +46,18 @@ def register(request):
 
 @login_required
 def edit_skills(request):
-    profile = request.user.profile
+    profile = request.profile
 
     if request.method == "POST":
         skills_text = request.POST.get("skills", "")
 
-        # Convert comma-separated string → list
-        skills_list = [
-            skill.strip().lower()
-            for skill in skills_text.split(",")
-            if skill.strip()
-        ]
+        # Convert comma-separated string → de-duplicated list (one lower() and one split for the whole string)
+        skills_list = list(dict.fromkeys(
+            skill for skill in _SKILL_SPLIT_RE.split(skills_text.strip().lower()) if skill
+        ))
 
         profile.parsed_skills = skills_list
-        profile.save()
+        profile.save(update_fields=['parsed_skills', 'updated_at'])
 
         messages.success(request, "Skills updated successfully.")
         return redirect("recommender:dashboard")
@@ -86,97 +93,112 @@ def handle_resume_upload(request):
         return redirect('recommender:upload_resume')
 
     try:
-        profile, _ = UserProfile.objects.get_or_create(user=request.user)
+        # Parse the upload while its bytes are still in memory instead of re-reading the saved copy
+        raw_text = extract_text_from_pdf(resume_file)
+        resume_file.seek(0)
+
+        # Record the task id before queueing so the status views can check ownership
+        task_id = str(uuid.uuid4())
+
+        profile = request.profile
         profile.resume_file = resume_file
-        profile.save()
+        profile.resume_task_id = task_id
+        profile.save(update_fields=['resume_file', 'resume_task_id', 'updated_at'])
 
-        pdf_path = profile.resume_file.path
-        raw_text = extract_text_from_pdf(pdf_path)
-        cleaned_text = clean_extracted_text(raw_text)
+        # Gemini structuring + matching runs on a Celery worker; the browser polls for completion
+        process_resume.apply_async((profile.id, raw_text), task_id=task_id)
 
-        structured_data = recommender.clean_resume_text(cleaned_text)
+        return redirect('recommender:processing', task_id=task_id)
 
-        def normalize(skills):
-            return [
-                skill.strip().lower()
-                for skill in skills
-                if skill and skill.strip()
-            ]
+    except Exception as e:
+        logger.error("Resume processing error", exc_info=True)
+        messages.error(request, "Error processing resume. Please try again.")
+        return redirect('recommender:upload_resume')
 
-        extracted_skills = normalize(structured_data.get('skills', []))
-        existing_skills = normalize(profile.parsed_skills or [])
 
-        updated_skills = existing_skills.copy()
+def _check_task_owner(request, task_id):
+    # Celery reports any unknown id as PENDING, so only the user's own latest task is visible
+    if task_id != request.profile.resume_task_id:
+        raise Http404("Unknown task")
 
-        for skill in extracted_skills:
-            if skill not in updated_skills:
-                updated_skills.append(skill)
 
-        profile.parsed_skills = updated_skills
-        
-        vector_summary = recommender.create_vector_summary(structured_data)
-        profile.vector_summary = vector_summary
-        profile.save()
+@login_required
+def processing(request, task_id):
+    _check_task_owner(request, task_id)
+    return render(request, 'recommender/processing.html', {'task_id': task_id})
 
-        matches = recommender.find_matching_internships(vector_summary, resume_skills=profile.parsed_skills, top_k=10)
 
-        recommended_internships = []
-        for item in matches:
-            try:
-                internship_id = int(item['id'])
-                score = item['final_score']
-
-                internship = Internship.objects.get(id=internship_id)
-                recommended_internships.append({
-                    'internship': internship,
-                    'final_score': round(score, 4),
-                    'match_percentage': round(item['final_score'] * 100, 2),
-                    'matching_skills_count': item.get('matching_skills_count', 0),
-                    'total_skills_count': item.get('total_skills_count', 0)
-                })
-            except Exception as e:
-                print("Skipping:", item, e)
+@login_required
+def task_status(request, task_id):
+    _check_task_owner(request, task_id)
+    result = AsyncResult(task_id)
+    return JsonResponse({'state': result.state})
 
 
-        context = {
-            'structured_data': structured_data,
-            'recommended_internships': recommended_internships,
-            'profile': profile
-        }
+@login_required
+def resume_results(request):
+    profile = request.profile
 
-        messages.success(request, "Resume analyzed successfully. Matching internships found!")
+    # Validate match items up front instead of catching arbitrary exceptions per row
+    valid_matches = []
+    for item in profile.matches:
+        try:
+            valid_matches.append((int(item['id']), float(item['final_score']), item))
+        except (KeyError, ValueError, TypeError):
+            logger.debug("bad match item %r", item)
 
-        return render(request, 'recommender/results.html', context)
+    internships = Internship.objects.filter(is_active=True).only(
+        'id', 'title', 'company', 'description', 'stipend', 'duration'
+    ).in_bulk([internship_id for internship_id, _, _ in valid_matches])
 
-    except Exception as e:
-        logger.error("Resume processing error", exc_info=True)
-        messages.error(request, "Error processing resume. Please try again.")
-        return redirect('recommender:upload_resume')
+    recommended_internships = []
+    for internship_id, score, item in valid_matches:
+        internship = internships.get(internship_id)
+        if not internship:
+            continue
+
+        recommended_internships.append({
+            'internship': internship,
+            'final_score': round(score, 4),
+            'match_percentage': round(score * 100, 2),
+            'matching_skills_count': item.get('matching_skills_count', 0),
+            'total_skills_count': item.get('total_skills_count', 0)
+        })
+
+
+    context = {
+        'structured_data': profile.structured_data,
+        'recommended_internships': recommended_internships,
+        'profile': profile
+    }
+
+    return render(request, 'recommender/results.html', context)
 
 
 @login_required
 def dashboard(request):
-    profile, _ = UserProfile.objects.get_or_create(user=request.user)
+    profile = request.profile
 
     recommended_internships = []
     if profile.vector_summary:
-        matches = recommender.find_matching_internships(profile.vector_summary, resume_skills=profile.parsed_skills, top_k=10)
+        matches = get_cached_matches(profile, top_k=10)
+
+        # One query for every match instead of one per card
+        ids = [int(item['id']) for item in matches]
+        internships = Internship.objects.filter(is_active=True).only('id', 'title', 'company').in_bulk(ids)
 
         for item in matches:
-            internship_id = item.get('id')
-            score = item.get('final_score')
+            internship = internships.get(int(item['id']))
+            if not internship:
+                continue
 
-            if internship_id:
-                try:
-                    internship = Internship.objects.get(id=internship_id, is_active=True)
-                    recommended_internships.append({
-                        'internship': internship,
-                        'final_score': round(score, 4),
-                        'match_percentage': round(item['final_score'] * 100, 2)
+            score = item.get('final_score')
+            recommended_internships.append({
+                'internship': internship,
+                'final_score': round(score, 4),
+                'match_percentage': round(item['final_score'] * 100, 2)
 
-                    })
-                except Internship.DoesNotExist:
-                    continue
+            })
 
 
     context = {
@@ -187,21 +209,27 @@ def dashboard(request):
 
 
 
+def _parse_cursor(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
 @login_required
 def internship_list(request):
 
-    queryset = Internship.objects.filter(is_active=True).order_by('-id')
+    # Only the columns the list cards render; skills JSON and bookkeeping fields stay unloaded
+    queryset = Internship.objects.filter(is_active=True).only(
+        'id', 'title', 'company', 'description', 'job_type', 'location', 'duration'
+    ).order_by('-id')
 
     selected_location = request.GET.get("location", "").strip()
     query = request.GET.get("q", "").strip()
 
     # Search Filter (TITLE, DESCRIPTION, COMPANY)
     if query:
-        queryset = queryset.filter(
-            Q(title__icontains=query) |
-            Q(description__icontains=query) |
-            Q(company__icontains=query)
-        )
+        queryset = search_internships(queryset, query)
 
     # Location Filter
     if selected_location:
@@ -209,35 +237,33 @@ def internship_list(request):
             location__icontains=selected_location
         )
 
-    # Pagination
-    paginator = Paginator(queryset, 20)
-    page_number = request.GET.get('page')
-
-    try:
-        internships = paginator.page(page_number)
-    except PageNotAnInteger:
-        internships = paginator.page(1)
-    except EmptyPage:
-        internships = paginator.page(paginator.num_pages)
+    # Keyset pagination on id: constant cost per page and no COUNT(*) query
+    after = _parse_cursor(request.GET.get('after'))
+    before = _parse_cursor(request.GET.get('before'))
 
-    # Build Location Dropdown
-    locations = Internship.objects.filter(
-        is_active=True
-    ).values_list("location", flat=True)
+    if before:
+        internships = list(queryset.filter(id__gt=before).order_by('id')[:PAGE_SIZE + 1])
+        has_previous = len(internships) > PAGE_SIZE
+        internships = internships[:PAGE_SIZE][::-1]
+        has_next = True
+    else:
+        if after:
+            queryset = queryset.filter(id__lt=after)
+        internships = list(queryset[:PAGE_SIZE + 1])
+        has_next = len(internships) > PAGE_SIZE
+        internships = internships[:PAGE_SIZE]
+        has_previous = bool(after)
 
-    city_set = set()
-    for loc in locations:
-        if loc:
-            parts = loc.split(",")
-            for city in parts:
-                cleaned = city.strip()
-                if cleaned:
-                    city_set.add(cleaned)
+    next_cursor = internships[-1].id if has_next and internships else None
+    previous_cursor = internships[0].id if has_previous and internships else None
 
-    city_list = sorted(list(city_set))
+    # Build Location Dropdown
+    city_list = get_active_city_list()
 
     context = {
         'internships': internships,
+        'next_cursor': next_cursor,
+        'previous_cursor': previous_cursor,
         'selected_location': selected_location,
         'city_list': city_list,
         'query': query,
@@ -249,25 +275,21 @@ def internship_list(request):
 @login_required
 def internship_detail(request, internship_id):
     try:
-        internship = Internship.objects.get(id=internship_id, is_active=True)
-        match_score = None
-
-        profile = UserProfile.objects.filter(user=request.user).first()
-        if profile and profile.vector_summary:
-            matches = recommender.find_matching_internships(profile.vector_summary, resume_skills=profile.parsed_skills, top_k=10)
-
-            for item in matches:
-                if item.get('id') == internship_id:
-                    score = item.get('final_score')
-                    match_score = round(item['final_score'] * 100, 2)
+        internship = Internship.objects.defer(
+            'skills_required', 'skills_normalized'
+        ).get(id=internship_id, is_active=True)
+        hit = None
 
-                    break
+        profile = request.profile
+        if profile.vector_summary:
+            matches = get_cached_matches(profile, top_k=50)
+            hit = next((item for item in matches if int(item['id']) == internship_id), None)
 
         context = {
             'internship': internship,
-            'match_score': match_score,
-            'matching_skills': item.get('matching_skills', []),
-            'non_matching_skills': item.get('non_matching_skills', [])
+            'match_score': round(hit['final_score'] * 100, 2) if hit else None,
+            'matching_skills': hit.get('matching_skills', []) if hit else [],
+            'non_matching_skills': hit.get('non_matching_skills', []) if hit else []
         }
         return render(request, 'recommender/internship_detail.html', context)
 